@@ -1,8 +1,17 @@
-from flask import Flask, request, jsonify, make_response
+from flask import Flask, Response, request, make_response
 from flask_cors import CORS
+import click
+from cachetools import TTLCache
+from contextlib import closing, contextmanager
 import os
+import functools
+import threading
 import mysql.connector
-import json
+from mysql.connector import errorcode
+from mysql.connector.pooling import MySQLConnectionPool
+import orjson
+import re
+import numpy as np
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -17,58 +26,247 @@ app.secret_key = os.getenv("SECRET_KEY", "dev-fallback-key")
 CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
 
 # --- DATABASE CONNECTION ---
-def get_db_connection():
-    # Verify CA file exists to prevent silent failures
-    ca_path = os.path.join(BASE_DIR, "ca.pem")
-    if not os.path.exists(ca_path):
-        print(f"❌ Error: ca.pem not found at {ca_path}")
-        raise FileNotFoundError("SSL Certificate ca.pem is missing")
+# One pool per process, created on first use so that each gunicorn worker
+# opens its own connections after fork. conn.close() on a pooled
+# connection hands it back to the pool instead of tearing down TLS.
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Verify CA file exists to prevent silent failures
+                ca_path = os.path.join(BASE_DIR, "ca.pem")
+                if not os.path.exists(ca_path):
+                    print(f"❌ Error: ca.pem not found at {ca_path}")
+                    raise FileNotFoundError("SSL Certificate ca.pem is missing")
+
+                _pool = MySQLConnectionPool(
+                    pool_name="proteins",
+                    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+                    pool_reset_session=False,
+                    # Reads must not hold a transaction (and its REPEATABLE READ
+                    # snapshot) open across checkouts; writes that need one
+                    # start it explicitly in db_connection(commit=True)
+                    autocommit=True,
+                    # Discard any rows a caller left unread instead of failing
+                    # the connection's next query
+                    consume_results=True,
+                    host=os.getenv("DB_HOST", "bme512-mysql-igm4emperor-d381.h.aivencloud.com"),
+                    port=int(os.getenv("DB_PORT", "23377")),
+                    user=os.getenv("DB_USER", "avnadmin"),
+                    password=os.getenv("DB_PASSWORD"),
+                    database=os.getenv("DB_NAME", "defaultdb"),
+                    ssl_ca=ca_path,
+                    ssl_verify_cert=True,
+                    ssl_verify_identity=True,
+                    connect_timeout=10,
+                    # C extension by default; DB_USE_PURE=1 for platforms without it
+                    use_pure=os.getenv("DB_USE_PURE") == "1"
+                )
+    return _pool
 
+def get_db_connection():
     try:
-        connection = mysql.connector.connect(
-            host=os.getenv("DB_HOST", "bme512-mysql-igm4emperor-d381.h.aivencloud.com"),
-            port=int(os.getenv("DB_PORT", "23377")),
-            user=os.getenv("DB_USER", "avnadmin"),
-            password=os.getenv("DB_PASSWORD"),
-            database=os.getenv("DB_NAME", "defaultdb"),
-            ssl_ca=ca_path,
-            ssl_verify_cert=True,
-            ssl_verify_identity=True,
-            connect_timeout=10, 
-            use_pure=True
-        )
-        return connection
+        return _get_pool().get_connection()
     except mysql.connector.Error as err:
         print(f"❌ DB Connection failed: {err}")
         raise
 
+def prepared_cursor(conn, sql, dictionary=False):
+    """Return a cursor with `sql` already prepared on this pooled connection.
+
+    Cursors are cached on the underlying connection, one per statement, so
+    the server parses and plans each statement once per connection. The
+    cache is dropped if the pool reconnects. Do not close the returned
+    cursor; run it with cursor.execute(sql, params).
+    """
+    cnx = getattr(conn, "_cnx", conn)  # the real connection behind the pool wrapper
+    cache = getattr(cnx, "_prepared_cursors", None)
+    if cache is None or cache[0] != cnx.connection_id:
+        cache = (cnx.connection_id, {})
+        cnx._prepared_cursors = cache
+    cursors = cache[1]
+    key = (sql, dictionary)
+    if key not in cursors:
+        cursors[key] = cnx.cursor(prepared=True, dictionary=dictionary)
+    return cursors[key]
+
+@contextmanager
+def db_connection(commit=False):
+    """Check out a pooled connection and always hand it back.
+
+    Connections autocommit. With commit=True the block is one explicit
+    transaction: committed when it finishes, rolled back if it raises, so
+    no half-done work is returned to the pool.
+    """
+    conn = get_db_connection()
+    try:
+        if commit:
+            conn.start_transaction()
+        yield conn
+        if commit:
+            conn.commit()
+    except Exception:
+        if commit:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+# --- JSON RESPONSES ---
+# orjson encodes in C and skips the stdlib's ensure_ascii pass; used in
+# place of jsonify everywhere
+def json_response(payload):
+    return Response(orjson.dumps(payload), mimetype="application/json")
+
 # --- ERROR HANDLERS ---
 # These catch server crashes and send JSON instead of HTML
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({"error": "Internal Server Error", "details": str(error)}), 500
+    return json_response({"error": "Internal Server Error", "details": str(error)}), 500
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({"error": "Endpoint not found"}), 404
+    return json_response({"error": "Endpoint not found"}), 404
 
 @app.errorhandler(Exception)
 def handle_exception(e):
-    return jsonify({"error": str(e)}), 500
+    return json_response({"error": str(e)}), 500
 
 # --- HEALTH CHECK ENDPOINT ---
 # Visit /health to prove the server is running
 @app.route("/health", methods=["GET"])
 def health_check():
-    return jsonify({"status": "active", "message": "Backend is running!"}), 200
+    return json_response({"status": "active", "message": "Backend is running!"}), 200
+
+# --- HELPER FUNCTIONS ---
+AMINO_ACID_WEIGHTS = {
+    'A': 89.09,  'R': 174.20, 'N': 132.12, 'D': 133.10,
+    'C': 121.15, 'Q': 146.15, 'E': 147.13, 'G': 75.07,
+    'H': 155.16, 'I': 131.17, 'L': 131.17, 'K': 146.19,
+    'M': 149.21, 'F': 165.19, 'P': 115.13, 'S': 105.09,
+    'T': 119.12, 'W': 204.23, 'Y': 181.19, 'V': 117.15
+}
+
+# Alphabetical so frequency dicts and the count columns have a stable order
+AMINO_ACID_ORDER = tuple(sorted(AMINO_ACID_WEIGHTS))
+
+# Finds the first non-residue character in C without building a new string
+_INVALID_RE = re.compile(f"[^{''.join(AMINO_ACID_ORDER)}]")
+
+# 256-entry lookup table indexed by byte value, so one np.bincount over the
+# encoded sequence yields weight and frequencies in a single pass.
+_AA_CODES = np.frombuffer("".join(AMINO_ACID_ORDER).encode("ascii"), dtype=np.uint8)
+WEIGHT_LUT = np.zeros(256, dtype=np.float64)
+WEIGHT_LUT[_AA_CODES] = [AMINO_ACID_WEIGHTS[aa] for aa in AMINO_ACID_ORDER]
+
+# Byte value -> position in AMINO_ACID_ORDER, or -1 for anything else
+_AA_INDEX = np.full(256, -1, dtype=np.int8)
+_AA_INDEX[_AA_CODES] = np.arange(len(AMINO_ACID_ORDER), dtype=np.int8)
+
+# numba is optional: it fuses the scan into one loop with no bincount
+# temporaries, which pays off on multi-megabase sequences.
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _analyze_kernel(buf, weight_lut, aa_index):
+        weight = 0.0
+        counts = np.zeros(20, np.int64)
+        for i in range(buf.shape[0]):
+            c = buf[i]
+            idx = aa_index[c]
+            if idx >= 0:
+                counts[idx] += 1
+                weight += weight_lut[c]
+        return weight, counts
+
+    # Compile (or load from cache) now rather than on the first request
+    _analyze_kernel(np.frombuffer(b"A", dtype=np.uint8), WEIGHT_LUT, _AA_INDEX)
+
+def _analyze_sequence(sequence):
+    arr = np.frombuffer(sequence.encode("utf-8"), dtype=np.uint8)
+    if _NUMBA_AVAILABLE:
+        weight, counts = _analyze_kernel(arr, WEIGHT_LUT, _AA_INDEX)
+        return round(weight, 2), tuple(counts.tolist())
+
+    byte_counts = np.bincount(arr, minlength=256)
+    mol_weight = round(float(byte_counts @ WEIGHT_LUT), 2)
+    return mol_weight, tuple(byte_counts[_AA_CODES].tolist())
+
+# Resubmitted sequences skip the scan entirely. Only sequences below the
+# length cap are cached, which bounds the cache's memory held by its keys.
+_CACHE_MAX_LENGTH = 10_000
+_analyze_sequence_cached = functools.lru_cache(maxsize=4096)(_analyze_sequence)
+
+def analyze_sequence(sequence):
+    """Return (molecular_weight, counts) for an uppercased sequence.
+
+    counts follows AMINO_ACID_ORDER; characters that are not amino acid
+    letters are ignored by both.
+    """
+    if len(sequence) < _CACHE_MAX_LENGTH:
+        return _analyze_sequence_cached(sequence)
+    return _analyze_sequence(sequence)
+
+def protein_fields(sequence):
+    """Return (length, molecular_weight, unique_count, counts) for storage.
+
+    Like analyze_sequence, expects the sequence already stripped and
+    uppercased: the routes' single .strip().upper() is the only copy made
+    of the input.
+    """
+    mol_weight, counts = analyze_sequence(sequence)
+    unique_count = sum(1 for count in counts if count)
+    return len(sequence), mol_weight, unique_count, counts
 
 # --- AUTOMATIC TABLE CREATION ---
-def create_table():
-    conn = None
+# One typed count column per residue, in AMINO_ACID_ORDER. SMALLINT UNSIGNED
+# is enough because the TEXT sequence column holds at most 65,535 residues.
+# frequencies survives as a generated JSON view of the counts for clients
+# and queries that still read it.
+COUNT_COLUMNS = tuple(f"cnt_{aa}" for aa in AMINO_ACID_ORDER)
+_COUNT_COLUMN_DEFS = ",\n".join(
+    f"{column} SMALLINT UNSIGNED NOT NULL DEFAULT 0" for column in COUNT_COLUMNS
+)
+_FREQUENCIES_DEF = "frequencies JSON AS (JSON_OBJECT({})) VIRTUAL".format(
+    ", ".join(f"'{aa}', cnt_{aa}" for aa in AMINO_ACID_ORDER)
+)
+
+# Bring tables created by older versions up to date. Each statement is
+# paired with the error code it raises when it has already been applied.
+SCHEMA_UPGRADES = [
+    ("ALTER TABLE proteins ADD FULLTEXT INDEX ft_proteins_name (name)", errorcode.ER_DUP_KEYNAME),
+    ("ALTER TABLE proteins ADD INDEX idx_proteins_name (name(64))", errorcode.ER_DUP_KEYNAME),
+]
+
+SCHEMA_LOCK_NAME = "proteins_schema"
+SCHEMA_LOCK_TIMEOUT = 300
+
+@contextmanager
+def _schema_lock(cursor):
+    """Hold a MySQL named lock so concurrent create_table() calls (one per
+    worker under INIT_DB=1) run the checks and ALTERs one after another."""
+    cursor.execute("SELECT GET_LOCK(%s, %s)", (SCHEMA_LOCK_NAME, SCHEMA_LOCK_TIMEOUT))
+    if cursor.fetchall()[0][0] != 1:
+        raise RuntimeError(f"Timed out waiting for the '{SCHEMA_LOCK_NAME}' lock")
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        create_table_query = """
+        yield
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (SCHEMA_LOCK_NAME,))
+        cursor.fetchall()
+
+def create_table():
+    """Create the proteins table or upgrade an older one; raises on failure."""
+    with db_connection(commit=True) as conn, closing(conn.cursor()) as cursor, _schema_lock(cursor):
+        create_table_query = f"""
         CREATE TABLE IF NOT EXISTS proteins (
             id INT AUTO_INCREMENT PRIMARY KEY,
             name VARCHAR(255) NOT NULL,
@@ -76,43 +274,92 @@ def create_table():
             length INT NOT NULL,
             molecular_weight FLOAT NOT NULL,
             unique_count INT NOT NULL,
-            frequencies TEXT NOT NULL
+            {_COUNT_COLUMN_DEFS},
+            {_FREQUENCIES_DEF},
+            INDEX idx_proteins_name (name(64)),
+            FULLTEXT INDEX ft_proteins_name (name)
         );
         """
         cursor.execute(create_table_query)
-        conn.commit()
-        print("✅ Table 'proteins' checked/created.")
+
+        cursor.execute(
+            "SELECT COLUMN_NAME, EXTRA FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'proteins'"
+        )
+        columns = dict(cursor.fetchall())
+        if COUNT_COLUMNS[0] not in columns:
+            cursor.execute(f"ALTER TABLE proteins ADD COLUMN ({_COUNT_COLUMN_DEFS})")
+        if "GENERATED" not in columns["frequencies"].upper():
+            # Older tables stored the counts as a JSON blob: copy them into
+            # the count columns, then swap the blob (and any freq_* columns
+            # derived from it) for the generated view
+            assignments = ", ".join(
+                f"cnt_{aa} = COALESCE(JSON_EXTRACT(frequencies, '$.{aa}'), 0)" for aa in AMINO_ACID_ORDER
+            )
+            cursor.execute(f"UPDATE proteins SET {assignments}")
+            drops = [f"DROP COLUMN {column}" for column in columns if column.startswith("freq_")]
+            drops.append("DROP COLUMN frequencies")
+            cursor.execute(f"ALTER TABLE proteins {', '.join(drops)}, ADD COLUMN {_FREQUENCIES_DEF}")
+
+        for statement, applied_errno in SCHEMA_UPGRADES:
+            try:
+                cursor.execute(statement)
+            except mysql.connector.Error as err:
+                if err.errno != applied_errno:
+                    raise
+    print("✅ Table 'proteins' checked/created.")
+
+# Schema setup is a deploy step: `flask --app app init-db`, run by
+# render.yaml's preDeployCommand (or the Procfile's release phase elsewhere).
+# Hosts with neither can set INIT_DB=1 instead; the schema lock keeps the
+# workers from running the ALTERs concurrently.
+@app.cli.command("init-db")
+def init_db_command():
+    try:
+        create_table()
     except Exception as e:
-        print(f"❌ Table creation warning: {e}")
-    finally:
-        if conn and conn.is_connected(): conn.close()
+        raise click.ClickException(f"Table creation failed: {e}")
 
-# Initialize DB on start
-with app.app_context():
+if os.getenv("INIT_DB") == "1":
     create_table()
 
-# --- HELPER FUNCTIONS ---
-VALID_AMINO_ACIDS = set("ARNDCEQGHILKMFPSTWYV")
-AMINO_ACID_WEIGHTS = {
-    'A': 89.09,  'R': 174.20, 'N': 132.12, 'D': 133.10,
-    'C': 121.15, 'Q': 146.15, 'E': 147.13, 'G': 75.07,
-    'H': 155.16, 'I': 131.17, 'L': 131.17, 'K': 146.19,
-    'M': 149.21, 'F': 165.19, 'P': 115.13, 'S': 105.09,
-    'T': 119.12, 'W': 204.23, 'Y': 181.19, 'V': 117.15
-}
-
-def calculate_molecular_weight(sequence):
-    weight = sum(AMINO_ACID_WEIGHTS.get(aa, 0) for aa in sequence.upper())
-    return round(weight, 2)
-
-def amino_acid_frequency(sequence):
-    freq = {aa: 0 for aa in VALID_AMINO_ACIDS}
-    for aa in sequence.upper():
-        if aa in freq:
-            freq[aa] += 1
-    return freq
-
 # --- API ROUTES ---
+INSERT_PROTEIN_SQL = (
+    f"INSERT INTO proteins (name, sequence, length, molecular_weight, unique_count, {', '.join(COUNT_COLUMNS)}) "
+    f"VALUES (%s, %s, %s, %s, %s, {', '.join(['%s'] * len(COUNT_COLUMNS))})"
+)
+UPDATE_PROTEIN_SQL = (
+    "UPDATE proteins SET name=%s, sequence=%s, length=%s, molecular_weight=%s, unique_count=%s, "
+    f"{', '.join(f'{column}=%s' for column in COUNT_COLUMNS)} WHERE id=%s"
+)
+SELECT_PROTEIN_SQL = (
+    f"SELECT id, name, sequence, length, molecular_weight, unique_count, {', '.join(COUNT_COLUMNS)} "
+    "FROM proteins WHERE id=%s"
+)
+DELETE_PROTEIN_SQL = "DELETE FROM proteins WHERE id=%s"
+BULK_CHUNK_SIZE = 10_000
+# Each chunk goes out as one multi-row INSERT, so it also has to stay well
+# under the server's max_allowed_packet
+BULK_CHUNK_BYTES = 4 * 1024 * 1024
+# Column limits: TEXT holds 65,535 bytes (which also keeps every cnt_*
+# within SMALLINT UNSIGNED) and name is VARCHAR(255)
+MAX_SEQUENCE_LENGTH = 65_535
+MAX_NAME_LENGTH = 255
+
+# Decoded /protein/<id> rows, dropped on edit/delete. The cache is per
+# process, so other workers may serve a stale row for up to the TTL.
+_PROTEIN_CACHE = TTLCache(maxsize=1024, ttl=60)
+_protein_cache_lock = threading.Lock()
+# Bumped on every invalidation so a read that fetched the row before a
+# concurrent edit/delete committed cannot put the old row back afterwards.
+# Entries expire long after any in-flight read could still be comparing
+# against them, so the counters don't accumulate for every id ever edited.
+_protein_generations = TTLCache(maxsize=65_536, ttl=600)
+
+def _invalidate_protein(protein_id):
+    with _protein_cache_lock:
+        _PROTEIN_CACHE.pop(protein_id, None)
+        _protein_generations[protein_id] = _protein_generations.get(protein_id, 0) + 1
 
 @app.route("/analyze", methods=["POST", "OPTIONS"])
 def analyze():
@@ -124,113 +371,249 @@ def analyze():
     sequence = data.get("sequence", "").strip().upper()
 
     if not protein_name or not sequence:
-        return jsonify({"error": "Protein name and sequence are required."}), 400
+        return json_response({"error": "Protein name and sequence are required."}), 400
 
-    invalid_chars = [c for c in sequence if c not in VALID_AMINO_ACIDS]
-    if invalid_chars:
-        return jsonify({"error": f"Invalid characters: {', '.join(invalid_chars)}"}), 400
+    invalid = _INVALID_RE.search(sequence)
+    if invalid:
+        return json_response({"error": f"Invalid character at position {invalid.start() + 1}: {invalid.group()}"}), 400
 
-    seq_length = len(sequence)
-    mol_weight = calculate_molecular_weight(sequence)
-    freq_dict = amino_acid_frequency(sequence)
-    unique_count = len([aa for aa in freq_dict if freq_dict[aa] > 0])
-    freq_json = json.dumps(freq_dict)
+    seq_length, mol_weight, unique_count, counts = protein_fields(sequence)
 
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO proteins (name, sequence, length, molecular_weight, unique_count, frequencies) "
-            "VALUES (%s, %s, %s, %s, %s, %s)",
-            (protein_name, sequence, seq_length, mol_weight, unique_count, freq_json)
-        )
-        conn.commit()
-        cursor.close()
+        with db_connection(commit=True) as conn:
+            cursor = prepared_cursor(conn, INSERT_PROTEIN_SQL)
+            cursor.execute(
+                INSERT_PROTEIN_SQL,
+                (protein_name, sequence, seq_length, mol_weight, unique_count, *counts)
+            )
     except Exception as e:
-        return jsonify({"error": f"Database Error: {str(e)}"}), 500
-    finally:
-        if conn and conn.is_connected(): conn.close()
+        return json_response({"error": f"Database Error: {str(e)}"}), 500
 
-    return jsonify({
+    return json_response({
         "message": "success",
         "data": {
             "name": protein_name,
             "length": seq_length,
             "molecular_weight": mol_weight,
             "unique_count": unique_count,
-            "amino_acids": list(freq_dict.keys()),
-            "frequencies": list(freq_dict.values())
+            "amino_acids": list(AMINO_ACID_ORDER),
+            "frequencies": list(counts)
         }
     })
 
-@app.route("/search", methods=["GET"])
-def search():
-    query_name = request.args.get("protein_name", "").strip()
-    query_sequence = request.args.get("sequence", "").strip().upper()
-    
-    conn = None
+def _bulk_chunks(rows):
+    """Split insert rows into chunks bounded by row count and by SQL size."""
+    chunk, chunk_bytes = [], 0
+    for row in rows:
+        # Escaped name (worst case doubled) + sequence + room for the numbers
+        row_bytes = 2 * len(row[0].encode("utf-8")) + len(row[1]) + 256
+        if chunk and (len(chunk) >= BULK_CHUNK_SIZE or chunk_bytes + row_bytes > BULK_CHUNK_BYTES):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(row)
+        chunk_bytes += row_bytes
+    if chunk:
+        yield chunk
+
+@app.route("/analyze_bulk", methods=["POST", "OPTIONS"])
+def analyze_bulk():
+    if request.method == "OPTIONS":
+        return _build_cors_preflight_response()
+
+    items = request.get_json(force=True, silent=True)
+    if not isinstance(items, list):
+        return json_response({"error": "Expected a JSON array of proteins."}), 400
+
+    rows = []
+    rejected = 0
+    for item in items:
+        protein_name = item.get("protein_name") if isinstance(item, dict) else None
+        sequence = item.get("sequence") if isinstance(item, dict) else None
+        # null, numbers and objects are rejected rather than stringified
+        if not isinstance(protein_name, str) or not isinstance(sequence, str):
+            rejected += 1
+            continue
+        protein_name = protein_name.strip()
+        sequence = sequence.strip().upper()
+        if (not protein_name or not sequence or len(protein_name) > MAX_NAME_LENGTH
+                or len(sequence) > MAX_SEQUENCE_LENGTH or _INVALID_RE.search(sequence)):
+            rejected += 1
+            continue
+
+        seq_length, mol_weight, unique_count, counts = protein_fields(sequence)
+        rows.append((protein_name, sequence, seq_length, mol_weight, unique_count, *counts))
+
+    if rows:
+        # One connection and one transaction for the whole batch
+        try:
+            with db_connection(commit=True) as conn, closing(conn.cursor()) as cursor:
+                for chunk in _bulk_chunks(rows):
+                    cursor.executemany(INSERT_PROTEIN_SQL, chunk)
+        except Exception as e:
+            return json_response({"error": f"Database Error: {str(e)}"}), 500
+
+    return json_response({"message": "success", "inserted": len(rows), "rejected": rejected})
+
+# List views never ship the sequence or frequencies blobs
+SEARCH_COLUMNS = "id, name, length, molecular_weight, unique_count"
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_SEQUENCE_QUERY = 50
+
+def _pagination():
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    offset = request.args.get("offset", 0, type=int)
+    return min(max(limit, 1), MAX_PAGE_SIZE), max(offset, 0)
+
+# InnoDB's innodb_ft_min_token_size default: shorter words are never indexed,
+# so requiring them in a BOOLEAN MODE query would match nothing
+FT_MIN_TOKEN_SIZE = 3
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _name_filters(query_name):
+    """Return (clauses, params) narrowing a search to names matching query_name."""
+    query_name = query_name.strip()
+    if not query_name:
+        return [], []
+    words = re.findall(r"\w+", query_name)
+    indexed = [word for word in words if len(word) >= FT_MIN_TOKEN_SIZE]
+    if not indexed:
+        # Nothing FULLTEXT can see: a prefix LIKE uses idx_proteins_name
+        return ["name LIKE %s"], [f"{_like_escape(query_name)}%"]
+
+    # BOOLEAN MODE: every indexable word required, prefix-matched; operators
+    # are dropped
+    clauses = ["MATCH(name) AGAINST(%s IN BOOLEAN MODE)"]
+    params = [" ".join(f"+{word}*" for word in indexed)]
+    if len(indexed) < len(words):
+        # Short words ("Cyclin D", "Interleukin 6") still have to match,
+        # checked only on the rows the index already narrowed down
+        clauses.append("name LIKE %s")
+        params.append(f"%{_like_escape(query_name)}%")
+    return clauses, params
+
+def _release_streaming(conn, cursor):
+    """Return a streaming connection to the pool, whatever was left unread."""
+    try:
+        if cursor is not None:
+            try:
+                cursor.fetchall()  # drain rows the client never received
+            except mysql.connector.Error:
+                pass
+            cursor.close()
+    finally:
+        conn.close()
+
+def _search_proteins(filters, params):
+    limit, offset = _pagination()
+    sql = f"SELECT {SEARCH_COLUMNS} FROM proteins WHERE 1=1"
+    for clause in filters:
+        sql += f" AND {clause}"
+    sql += " ORDER BY id DESC LIMIT %s OFFSET %s"
+
+    conn = cursor = None
     try:
         conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        sql = "SELECT * FROM proteins WHERE 1=1"
-        params = []
-
-        if query_name:
-            sql += " AND name LIKE %s"
-            params.append(f"%{query_name}%")
-        if query_sequence:
-            sql += " AND sequence LIKE %s"
-            params.append(f"%{query_sequence}%")
-            
-        if not query_name and not query_sequence:
-            sql += " ORDER BY id DESC LIMIT 20"
-
-        cursor.execute(sql, params)
-        proteins = cursor.fetchall()
-        cursor.close()
-        return jsonify(proteins)
+        # Unbuffered: rows are encoded as they arrive instead of all at once
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        cursor.execute(sql, (*params, limit, offset))
+        # Read the first row here so query errors still become a 500
+        first = cursor.fetchone()
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
-    finally:
-        if conn and conn.is_connected(): conn.close()
+        if conn: _release_streaming(conn, cursor)
+        return json_response({"error": str(e)}), 500
+
+    # An error after this point propagates out of the generator, which makes
+    # the server abort the chunked body instead of completing a 200 with
+    # truncated JSON.
+    def generate():
+        yield b"["
+        if first is not None:
+            yield orjson.dumps(first)
+            for row in cursor:
+                yield b"," + orjson.dumps(row)
+        yield b"]"
+
+    # Runs once the response is finished or the client goes away, even if
+    # the generator never started (e.g. HEAD requests)
+    response = Response(generate(), mimetype="application/json")
+    response.call_on_close(lambda: _release_streaming(conn, cursor))
+    return response
+
+@app.route("/search", methods=["GET"])
+def search():
+    # Older clients sent sequence queries here; keep honouring them
+    if request.args.get("sequence", "").strip():
+        return search_sequence()
+
+    filters, params = _name_filters(request.args.get("protein_name", ""))
+    return _search_proteins(filters, params)
+
+@app.route("/search/sequence", methods=["GET"])
+def search_sequence():
+    query_sequence = request.args.get("sequence", "").strip().upper()
+
+    if not query_sequence:
+        return json_response({"error": "Sequence is required."}), 400
+    if len(query_sequence) > MAX_SEQUENCE_QUERY:
+        return json_response({"error": f"Sequence query is limited to {MAX_SEQUENCE_QUERY} residues."}), 400
+    invalid = _INVALID_RE.search(query_sequence)
+    if invalid:
+        return json_response({"error": f"Invalid character at position {invalid.start() + 1}: {invalid.group()}"}), 400
+
+    filters, params = ["sequence LIKE %s"], [f"%{query_sequence}%"]
+    name_clauses, name_params = _name_filters(request.args.get("protein_name", ""))
+    filters += name_clauses
+    params += name_params
+    return _search_proteins(filters, params)
 
 @app.route("/protein/<int:protein_id>", methods=["GET"])
 def get_protein(protein_id):
-    conn = None
+    with _protein_cache_lock:
+        protein = _PROTEIN_CACHE.get(protein_id)
+        generation = _protein_generations.get(protein_id, 0)
+    if protein is not None:
+        return json_response(protein)
+
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM proteins WHERE id=%s", (protein_id,))
-        protein = cursor.fetchone()
-        cursor.close()
-        
-        if not protein:
-            return jsonify({"error": "Protein not found"}), 404
-            
-        return jsonify(protein)
+        with db_connection() as conn:
+            cursor = prepared_cursor(conn, SELECT_PROTEIN_SQL, dictionary=True)
+            cursor.execute(SELECT_PROTEIN_SQL, (protein_id,))
+            rows = cursor.fetchall()
+
+        if not rows:
+            return json_response({"error": "Protein not found"}), 404
+        protein = rows[0]
+
+        # The binary protocol decodes the FLOAT column as a raw float32
+        # (1234.56005859375); round back to the stored precision so this
+        # matches /search, which reads it as text
+        protein["molecular_weight"] = round(protein["molecular_weight"], 2)
+        # Clients read the counts as one {residue: count} object
+        protein["frequencies"] = {aa: protein.pop(f"cnt_{aa}") for aa in AMINO_ACID_ORDER}
+
+        with _protein_cache_lock:
+            if _protein_generations.get(protein_id, 0) == generation:
+                _PROTEIN_CACHE[protein_id] = protein
+        return json_response(protein)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
-    finally:
-        if conn and conn.is_connected(): conn.close()
+        return json_response({"error": str(e)}), 500
 
 @app.route("/delete/<int:protein_id>", methods=["DELETE", "OPTIONS"])
 def delete_protein(protein_id):
     if request.method == "OPTIONS":
         return _build_cors_preflight_response()
         
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM proteins WHERE id=%s", (protein_id,))
-        conn.commit()
-        cursor.close()
-        return jsonify({"message": "success"})
+        with db_connection(commit=True) as conn:
+            cursor = prepared_cursor(conn, DELETE_PROTEIN_SQL)
+            cursor.execute(DELETE_PROTEIN_SQL, (protein_id,))
+        _invalidate_protein(protein_id)
+        return json_response({"message": "success"})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
-    finally:
-        if conn and conn.is_connected(): conn.close()
+        return json_response({"error": str(e)}), 500
 
 @app.route("/edit/<int:protein_id>", methods=["POST", "OPTIONS"])
 def edit_protein(protein_id):
@@ -241,27 +624,19 @@ def edit_protein(protein_id):
     name = data.get("protein_name", "").strip()
     sequence = data.get("sequence", "").strip().upper()
 
-    seq_length = len(sequence)
-    mol_weight = calculate_molecular_weight(sequence)
-    freq_dict = amino_acid_frequency(sequence)
-    unique_count = len([aa for aa in freq_dict if freq_dict[aa] > 0])
-    freq_json = json.dumps(freq_dict)
+    seq_length, mol_weight, unique_count, counts = protein_fields(sequence)
 
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE proteins SET name=%s, sequence=%s, length=%s, molecular_weight=%s, unique_count=%s, frequencies=%s WHERE id=%s",
-            (name, sequence, seq_length, mol_weight, unique_count, freq_json, protein_id)
-        )
-        conn.commit()
-        cursor.close()
-        return jsonify({"message": "success"})
+        with db_connection(commit=True) as conn:
+            cursor = prepared_cursor(conn, UPDATE_PROTEIN_SQL)
+            cursor.execute(
+                UPDATE_PROTEIN_SQL,
+                (name, sequence, seq_length, mol_weight, unique_count, *counts, protein_id)
+            )
+        _invalidate_protein(protein_id)
+        return json_response({"message": "success"})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
-    finally:
-        if conn and conn.is_connected(): conn.close()
+        return json_response({"error": str(e)}), 500
 
 def _build_cors_preflight_response():
     response = make_response()
@@ -271,4 +646,4 @@ def _build_cors_preflight_response():
     return response
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=os.getenv("FLASK_DEBUG") == "1")
\ No newline at end of file
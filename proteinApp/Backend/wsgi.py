@@ -0,0 +1,5 @@
+# Production entry point: gunicorn wsgi:app (see Procfile)
+from app import app
+
+if __name__ == "__main__":
+    app.run()